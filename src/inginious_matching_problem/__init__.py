@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 import os
-from collections import defaultdict
+from functools import lru_cache
 from hashlib import sha256
+from operator import eq
 from random import Random
 from typing import TYPE_CHECKING, Any
 
-from flask import Response, send_from_directory
+from flask import send_from_directory
 from inginious.common.tasks_problems import Problem
 from inginious.frontend.pages.utils import INGIniousPage
 from inginious.frontend.parsable_text import ParsableText
@@ -15,6 +16,7 @@ from inginious.frontend.task_problems import DisplayableProblem
 if TYPE_CHECKING:
     from gettext import NullTranslations
 
+    from flask import Response
     from inginious.client.client import Client
     from inginious.common.filesystems import FileSystemProvider
     from inginious.frontend.course_factory import CourseFactory
@@ -30,6 +32,67 @@ PATH_TO_TEMPLATES = os.path.join(PATH_TO_PLUGIN, "templates")
 
 
 MIN_QUESTION_NUMBER = 3
+MATCH_STRIP_KEYS = frozenset(
+    ("question", "answer", "success_feedback", "error_feedback")
+)
+
+
+def _is_blank(text: str) -> bool:
+    """Checks if a text is empty or only contains whitespace.
+
+    Args:
+        text: The text to check.
+
+    Returns:
+        True if the text is blank, False otherwise.
+    """
+    return not text or text.isspace()
+
+
+@lru_cache(maxsize=4096)
+def _answer_hash(answer: str) -> str:
+    """Computes the SHA-256 hash of an answer.
+
+    Args:
+        answer: The answer.
+
+    Returns:
+        The hexadecimal hash of the answer.
+    """
+    return sha256(answer.encode()).hexdigest()
+
+
+@lru_cache(maxsize=256)
+def _shuffle_answers(
+    answers: tuple[tuple[str, str], ...], pid: str, language: str, seed: Any
+) -> tuple[tuple[str, str], ...]:
+    """Shuffles the answers deterministically.
+
+    Args:
+        answers: The (hash, answer) pairs to shuffle.
+        pid: The problem ID.
+        language: The language code.
+        seed: The random seed.
+
+    Returns:
+        The shuffled answers.
+    """
+    shuffled = list(answers)
+    Random(f"{pid}#{language}#{seed}").shuffle(shuffled)  # noqa: S311
+    return tuple(shuffled)
+
+
+def _grade(submitted_ids: list[int], expected_ids: list[int]) -> list[bool]:
+    """Grades the submitted answer IDs against the expected ones.
+
+    Args:
+        submitted_ids: The submitted answer IDs.
+        expected_ids: The expected answer IDs.
+
+    Returns:
+        For each question, whether the submitted answer is correct.
+    """
+    return list(map(eq, submitted_ids, expected_ids))
 
 
 class MatchingProblemStatic(INGIniousPage):
@@ -50,6 +113,24 @@ class MatchingProblemStatic(INGIniousPage):
 class MatchingProblem(Problem):
     """Display a list of questions which must be correctly matched a list of answers."""  # noqa: E501
 
+    __slots__ = (
+        "_pid",
+        "_header",
+        "_unshuffle",
+        "_centralize",
+        "_all_success_feedback",
+        "_partial_success_feedback",
+        "_all_error_feedback",
+        "_questions",
+        "_question_texts",
+        "_answer_texts",
+        "_success_feedbacks",
+        "_error_feedbacks",
+        "_answers",
+        "_answer_ids",
+        "_expected_ids",
+    )
+
     def __init__(
         self,
         problemid: str,
@@ -74,6 +155,7 @@ class MatchingProblem(Problem):
             )
 
         super().__init__(problemid, content, translations, taskfs)
+        self._pid = self.get_id()
         self._header = content.get("header", "")
         self._unshuffle = content.get("unshuffle", False)
         self._centralize = "centralize" in content
@@ -81,13 +163,44 @@ class MatchingProblem(Problem):
         self._partial_success_feedback = content.get("partial_success_feedback")
         self._all_error_feedback = content.get("all_error_feedback")
         self._questions: list[dict] = content["questions"]
-
-        if len({question["question"] for question in self.non_empty_questions}) != len(
-            self.non_empty_questions
-        ):
-            raise Exception(
-                f"All non-empty questions in problem {problemid} must be different"
+        self._question_texts: list[str] = []
+        self._answer_texts: list[str] = []
+        self._success_feedbacks: list[str | None] = []
+        self._error_feedbacks: list[str | None] = []
+
+        seen_questions: set[str] = set()
+        for question in self._questions:
+            if "answer" not in question:
+                raise Exception(
+                    f"All questions in problem {problemid} require an answer"
+                )
+            text = question.get("question")
+            if not text:
+                continue
+            if text in seen_questions:
+                raise Exception(
+                    f"All non-empty questions in problem {problemid} must be different"
+                )
+            seen_questions.add(text)
+            self._question_texts.append(text)
+            self._answer_texts.append(question["answer"])
+            self._success_feedbacks.append(question.get("success_feedback"))
+            self._error_feedbacks.append(question.get("error_feedback"))
+
+        self._answers: tuple[tuple[str, str], ...] = tuple(
+            (self.get_answer_hash(answer), answer)
+            for answer in dict.fromkeys(
+                question["answer"] for question in self._questions
             )
+        )
+
+        self._answer_ids: dict[str, int] = {
+            answer_hash: i for i, (answer_hash, _) in enumerate(self._answers)
+        }
+        self._expected_ids: list[int] = [
+            self._answer_ids[self.get_answer_hash(answer)]
+            for answer in self._answer_texts
+        ]
 
     @property
     def non_empty_questions(self) -> list[dict]:
@@ -97,9 +210,20 @@ class MatchingProblem(Problem):
             The list of non empty questions.
         """
         return [
-            question
-            for question in self._questions
-            if "question" in question and question["question"]
+            {
+                key: value
+                for key, value in zip(
+                    ("question", "answer", "success_feedback", "error_feedback"),
+                    question,
+                )
+                if value is not None
+            }
+            for question in zip(
+                self._question_texts,
+                self._answer_texts,
+                self._success_feedbacks,
+                self._error_feedbacks,
+            )
         ]
 
     @classmethod
@@ -127,14 +251,14 @@ class MatchingProblem(Problem):
         Returns:
             True if the input is consistent, False otherwise.
         """
-        pid = self.get_id()
-        answer_hashes = {
-            self.get_answer_hash(question["answer"]) for question in self._questions
-        }
+        pid = self._pid
         return (
             pid in task_input
-            and len(task_input[pid]) == len(self.non_empty_questions)
-            and all(answer_hash in answer_hashes for answer_hash in task_input[pid])
+            and len(task_input[pid]) == len(self._question_texts)
+            and all(
+                isinstance(answer_hash, str) and answer_hash in self._answer_ids
+                for answer_hash in task_input[pid]
+            )
         )
 
     def get_answer_hash(self, answer: str) -> str:
@@ -146,7 +270,7 @@ class MatchingProblem(Problem):
         Returns:
             The hash of the answer
         """
-        return sha256(answer.encode()).hexdigest()
+        return _answer_hash(answer)
 
     def input_type(self) -> type:
         """Returns the type of the input.
@@ -161,44 +285,36 @@ class MatchingProblem(Problem):
         task_input: dict[str, Any],
         language: str,
     ) -> tuple[bool, str | None, list[str] | None, int, str]:
-        feedbacks: list[str] = []
-        invalid_count = 0
-
-        non_empty_questions = self.non_empty_questions
-
-        question_ids: dict[str, set[int]] = defaultdict(set)
-        for i, question in enumerate(non_empty_questions):
-            question_ids[self.get_answer_hash(question["answer"])].add(i)
-
-        for i, answer_hash in enumerate(task_input[self.get_id()]):
-            if i in question_ids[answer_hash]:
-                if "success_feedback" in non_empty_questions[i]:
-                    feedbacks.append(non_empty_questions[i]["success_feedback"])
-            else:
-                invalid_count += 1
-                if "error_feedback" in non_empty_questions[i]:
-                    feedbacks.append(non_empty_questions[i]["error_feedback"])
+        get_answer_id = self._answer_ids.get
+        submitted_ids = [
+            get_answer_id(answer_hash, -1) for answer_hash in task_input[self._pid]
+        ]
+        grades = _grade(submitted_ids, self._expected_ids)
+        invalid_count = grades.count(False)
 
         if invalid_count == 0:
             global_message = self._all_success_feedback
             valid = True
-        elif invalid_count < len(non_empty_questions):
+        elif invalid_count < len(self._question_texts):
             global_message = self._partial_success_feedback
             valid = False
         else:
             global_message = self._all_error_feedback
             valid = False
 
-        if global_message is not None:
-            feedbacks.insert(0, global_message)
+        if self._centralize:
+            return valid, None, None, invalid_count, ""
 
-        return (
-            valid,
-            None,
-            feedbacks if not self._centralize and feedbacks else None,
-            invalid_count,
-            "",
-        )
+        feedbacks: list[str] = [] if global_message is None else [global_message]
+        append = feedbacks.append
+        for correct, success_feedback, error_feedback in zip(
+            grades, self._success_feedbacks, self._error_feedbacks
+        ):
+            feedback = success_feedback if correct else error_feedback
+            if feedback is not None:
+                append(feedback)
+
+        return valid, None, feedbacks if feedbacks else None, invalid_count, ""
 
     @classmethod
     def parse_problem(cls, problem_content: dict[str, Any]) -> dict[str, Any]:
@@ -216,35 +332,32 @@ class MatchingProblem(Problem):
         if "centralize" in problem_content:
             problem_content["centralize"] = True
 
-        if (
-            "all_success_feedback" in problem_content
-            and problem_content["all_success_feedback"].strip() == ""
+        if "all_success_feedback" in problem_content and _is_blank(
+            problem_content["all_success_feedback"]
         ):
             del problem_content["all_success_feedback"]
 
-        if (
-            "partial_success_feedback" in problem_content
-            and problem_content["partial_success_feedback"].strip() == ""
+        if "partial_success_feedback" in problem_content and _is_blank(
+            problem_content["partial_success_feedback"]
         ):
             del problem_content["partial_success_feedback"]
 
-        if (
-            "all_error_feedback" in problem_content
-            and problem_content["all_error_feedback"].strip() == ""
+        if "all_error_feedback" in problem_content and _is_blank(
+            problem_content["all_error_feedback"]
         ):
             del problem_content["all_error_feedback"]
 
         if "questions" in problem_content:
             problem_content["questions"] = [
-                val
-                for _, val in sorted(
-                    iter(problem_content["questions"].items()), key=lambda x: int(x[0])
+                {
+                    key: value
+                    for key, value in match.items()
+                    if key not in MATCH_STRIP_KEYS or not _is_blank(value)
+                }
+                for _, match in sorted(
+                    problem_content["questions"].items(), key=lambda item: int(item[0])
                 )
             ]
-            for match in problem_content["questions"]:
-                for key in ("question", "answer", "success_feedback", "error_feedback"):
-                    if key in match and match[key].strip() == "":
-                        del match[key]
 
         return Problem.parse_problem(problem_content)
 
@@ -273,6 +386,8 @@ class MatchingProblem(Problem):
 class MatchingDisplayableProblem(MatchingProblem, DisplayableProblem):  # type: ignore
     """A displayable matching problem."""
 
+    __slots__ = ()
+
     def __init__(
         self,
         problemid: str,
@@ -318,29 +433,28 @@ class MatchingDisplayableProblem(MatchingProblem, DisplayableProblem):  # type:
         Returns:
             The rendered input HTML.
         """
-        answers = list({question["answer"] for question in self._questions})
+        answers = self._answers
 
         if not self._unshuffle:
-            Random("{}#{}#{}".format(self.get_id(), language, seed)).shuffle(answers)  # noqa: S311
+            answers = _shuffle_answers(answers, self._pid, language, seed)
 
+        translation = self.get_translation_obj(language)
         header = ParsableText(
             self.gettext(language, self._header),
             "rst",
-            translation=self.get_translation_obj(language),
+            translation=translation,
         )
+        questions = [
+            ParsableText(self.gettext(language, text), "rst", translation=translation)
+            for text in self._question_texts
+        ]
         return template_helper.render(
             "tasks/matching.html",
             template_folder=PATH_TO_TEMPLATES,
-            pid=self.get_id(),
+            pid=self._pid,
             header=header,
-            questions=self.non_empty_questions,
+            questions=questions,
             answers=answers,
-            answer_hash=self.get_answer_hash,
-            display=lambda text: ParsableText(
-                self.gettext(language, text) if text else "",
-                "rst",
-                translation=self.get_translation_obj(language),
-            ),
         )
 
     @classmethod